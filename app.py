@@ -1,6 +1,6 @@
 import secrets
 import math
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session, abort, flash
+from flask import Flask, render_template, request, redirect, url_for, jsonify, session, abort, flash, g
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -137,6 +137,10 @@ def ensure_indexes():
         sparse=True,
         name="shop_mobile_idx",
     )
+    shops_col.create_index(
+        [("lookup_keys", 1)],
+        name="shop_lookup_keys_idx",
+    )
     banks_col.create_index(
         [("shop_identifier", 1)],
         name="bank_shop_idx",
@@ -145,6 +149,11 @@ def ensure_indexes():
         [("shop_identifier", 1), ("name", 1)],
         name="bank_shop_name_idx",
     )
+    banks_col.create_index(
+        [("shop_identifier", 1), ("name", 1)],
+        name="bank_shop_name_ci_idx",
+        collation={"locale": "en", "strength": 2},
+    )
     entries_col.create_index(
         [("shop_identifier", 1), ("date", 1), ("time", 1), ("entry_datetime", 1)],
         name="shop_date_time_entrydt_idx",
@@ -169,6 +178,61 @@ def ensure_indexes():
         [("shop_identifier", 1), ("date", 1), ("bank_name", 1), ("time", 1), ("entry_datetime", 1)],
         name="shop_date_bank_time_entrydt_idx",
     )
+    # Matches the report aggregation's $sort so the pre-$group sort can stream from the index.
+    entries_col.create_index(
+        [("shop_identifier", 1), ("bank_name", 1), ("date", 1), ("time", 1), ("entry_datetime", 1)],
+        name="shop_bank_date_time_entrydt_idx",
+    )
+
+
+def backfill_shop_lookup_keys():
+    # Legacy shops predate lookup_keys; collect identifier/mobile/email into one indexed array.
+    shops_col.update_many(
+        {"lookup_keys": {"$exists": False}},
+        [{
+            "$set": {
+                "lookup_keys": {
+                    "$filter": {
+                        "input": ["$identifier", "$mobile", "$email"],
+                        "cond": {"$ne": ["$$this", None]},
+                    }
+                }
+            }
+        }],
+    )
+
+
+def backfill_shop_entry_date_bounds():
+    # Seed each shop's entry date span so reports can skip ranges that hold no entries.
+    # $min/$max keep this correct even if entries are inserted while it runs.
+    for shop in shops_col.find(
+        {"entry_bounds_tracked": {"$ne": True}},
+        {"identifier": 1, "mobile": 1, "email": 1},
+    ):
+        shop_identifier = (
+            normalize_identifier(shop.get("identifier"))
+            or normalize_identifier(shop.get("mobile"))
+            or normalize_identifier(shop.get("email"))
+        )
+        update = {"$set": {"entry_bounds_tracked": True}}
+        # Only dated entries can fall inside a report range; undated ones sort first otherwise.
+        dated_query = {"shop_identifier": shop_identifier, "date": {"$type": "string"}}
+        first_entry = entries_col.find_one(
+            dated_query,
+            {"_id": 0, "date": 1},
+            sort=[("date", 1)],
+        )
+        last_entry = entries_col.find_one(
+            dated_query,
+            {"_id": 0, "date": 1},
+            sort=[("date", -1)],
+        )
+        first_date = (first_entry or {}).get("date")
+        last_date = (last_entry or {}).get("date")
+        if first_date is not None and last_date is not None:
+            update["$min"] = {"min_entry_date": first_date}
+            update["$max"] = {"max_entry_date": last_date}
+        shops_col.update_one({"_id": shop["_id"]}, update)
 
 
 mongo_fail_fast = env_bool("MONGO_FAIL_FAST", default=True)
@@ -186,6 +250,8 @@ except PyMongoError as e:
 if auto_create_indexes:
     try:
         ensure_indexes()
+        backfill_shop_lookup_keys()
+        backfill_shop_entry_date_bounds()
     except PyMongoError as e:
         app.logger.error(f"Database error while creating indexes: {e}")
         if mongo_fail_fast:
@@ -219,6 +285,122 @@ def find_shop_by_identifier(identifier):
         return None
 
 
+# Fields the route modules read from the logged-in shop document.
+CURRENT_SHOP_PROJECTION = {
+    "name": 1,
+    "password_hash": 1,
+    "data_version": 1,
+    "entry_bounds_tracked": 1,
+    "min_entry_date": 1,
+    "max_entry_date": 1,
+}
+
+
+def get_current_shop():
+    identifier = current_shop_identifier()
+    if not identifier:
+        return None
+    # Request-scoped cache: every caller in a request shares one shops_col lookup.
+    cached = g.get("_current_shop")
+    if cached is not None and cached[0] == identifier:
+        return cached[1]
+    try:
+        shop = shops_col.find_one({"lookup_keys": identifier}, CURRENT_SHOP_PROJECTION)
+        if shop is None:
+            # Shops not yet backfilled with lookup_keys still resolve via the legacy fields.
+            shop = shops_col.find_one(
+                {
+                    "$or": [
+                        {"identifier": identifier},
+                        {"mobile": identifier},
+                        {"email": identifier},
+                    ]
+                },
+                CURRENT_SHOP_PROJECTION,
+            )
+    except PyMongoError as e:
+        app.logger.error(f"Database error while loading current shop: {e}")
+        return None
+    g._current_shop = (identifier, shop)
+    return shop
+
+
+def current_shop_filter():
+    # Shop writes target the _id of the already-loaded shop document.
+    shop = get_current_shop()
+    return {"_id": shop["_id"]} if shop else None
+
+
+def mark_shop_data_changed():
+    # Bump data_version, which is part of the report and PDF cache keys.
+    shop_filter = current_shop_filter()
+    # Drop the request-cached shop so later reads in this request see the new value.
+    g.pop("_current_shop", None)
+    if shop_filter is None:
+        app.logger.error("Unable to mark shop data changed: current shop not loaded")
+        return
+    try:
+        shops_col.update_one(shop_filter, {"$inc": {"data_version": 1}})
+    except PyMongoError as e:
+        app.logger.error(f"Database error while marking shop data changed: {e}")
+
+
+def widen_shop_entry_bounds(entry_date):
+    # Run before inserting an entry: a span that is too wide is harmless, but one that
+    # misses the new date hides it from reports. Returns False (and PyMongoError
+    # propagates) when the span could not be widened, so the insert is aborted.
+    shop_filter = current_shop_filter()
+    g.pop("_current_shop", None)
+    if shop_filter is None:
+        return False
+    shops_col.update_one(
+        shop_filter,
+        {"$min": {"min_entry_date": entry_date}, "$max": {"max_entry_date": entry_date}},
+    )
+    return True
+
+
+DELETE_GUARD_TTL = timedelta(minutes=10)
+
+
+def claim_shop_delete(delete_key):
+    # Atomically mark a bulk delete as started; False if the same delete ran recently.
+    # Stored on the shop document so every worker sees it.
+    shop_filter = current_shop_filter()
+    if shop_filter is None:
+        # Same as a DB error below: don't block the delete when the guard can't be checked.
+        return True
+    now = local_now()
+    try:
+        result = shops_col.update_one(
+            {
+                **shop_filter,
+                "$or": [
+                    {"delete_guard.key": {"$ne": delete_key}},
+                    {"delete_guard.expires_at": {"$lt": now}},
+                ],
+            },
+            {"$set": {"delete_guard": {"key": delete_key, "expires_at": now + DELETE_GUARD_TTL}}},
+        )
+    except PyMongoError as e:
+        app.logger.error(f"Database error while claiming delete guard: {e}")
+        return True
+    return result.matched_count > 0
+
+
+def release_shop_delete(delete_key):
+    shop_filter = current_shop_filter()
+    if shop_filter is None:
+        return
+    try:
+        shops_col.update_one(
+            {**shop_filter, "delete_guard.key": delete_key},
+            {"$unset": {"delete_guard": ""}},
+        )
+    except PyMongoError as e:
+        app.logger.error(f"Database error while releasing delete guard: {e}")
+
+
 def render_daily_entry_page(banks, today, selected_bank=None, error=None, entries=None, edit_entry=None):
     if entries is None:
         entries = []
@@ -267,6 +449,9 @@ def inject_csrf_token():
 # -----------------------------
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 MOBILE_RE = re.compile(r"^\d{10,15}$")
+PASSWORD_UPPER_RE = re.compile(r"[A-Z]")
+PASSWORD_LOWER_RE = re.compile(r"[a-z]")
+PASSWORD_DIGIT_RE = re.compile(r"\d")
 
 
 def is_valid_identifier(value):
@@ -279,9 +464,9 @@ def is_valid_identifier(value):
 def is_valid_password(value):
     if not value or len(value) < 8:
         return False
-    has_upper = re.search(r"[A-Z]", value)
-    has_lower = re.search(r"[a-z]", value)
-    has_digit = re.search(r"\d", value)
+    has_upper = PASSWORD_UPPER_RE.search(value)
+    has_lower = PASSWORD_LOWER_RE.search(value)
+    has_digit = PASSWORD_DIGIT_RE.search(value)
     return bool(has_upper and has_lower and has_digit)
 
 
@@ -426,6 +611,9 @@ def signup():
                     result = shops_col.insert_one({
                         "name": shop_name,
                         "identifier": identifier,
+                        "lookup_keys": [identifier],
+                        # A new shop has no entries, so its (empty) date span is already exact.
+                        "entry_bounds_tracked": True,
                         "password_hash": generate_password_hash(password)
                     })
                     if not result.inserted_id:
@@ -510,12 +698,13 @@ bank_module = register_bank_routes(
     app=app,
     banks_col=banks_col,
     entries_col=entries_col,
-    shops_col=shops_col,
     parse_non_negative_float=parse_non_negative_float,
     check_password_hash_fn=check_password_hash,
     to_object_id=to_object_id,
     verify_csrf=verify_csrf,
     current_shop_identifier=current_shop_identifier,
+    get_current_shop=get_current_shop,
+    mark_shop_data_changed=mark_shop_data_changed,
 )
 get_shop_banks = bank_module["get_shop_banks"]
 recalculate_bank_balances_from_date = bank_module["recalculate_bank_balances_from_date"]
@@ -524,6 +713,18 @@ recalculate_bank_balances_from_date = bank_module["recalculate_bank_balances_fro
 # -----------------------------
 # ENTRY ROUTES
 # -----------------------------
+# Fields daily_entry.html shows for recent entries (_id is kept for edit/delete links).
+RECENT_ENTRY_PROJECTION = {
+    "date": 1,
+    "time": 1,
+    "bank_name": 1,
+    "opening_balance": 1,
+    "credited": 1,
+    "debited": 1,
+    "remaining_balance": 1,
+}
+
+
 @app.route("/add-entry", methods=["GET", "POST"])
 def add_entry():
     error = None
@@ -536,10 +737,13 @@ def add_entry():
         from_date = (local_today() - timedelta(days=6)).isoformat()
         try:
             return list(
-                entries_col.find({
-                    "shop_identifier": current_shop_identifier(),
-                    "date": {"$gte": from_date}
-                })
+                entries_col.find(
+                    {
+                        "shop_identifier": current_shop_identifier(),
+                        "date": {"$gte": from_date}
+                    },
+                    RECENT_ENTRY_PROJECTION,
+                )
                 .sort([("date", -1), ("time", -1)])
             )
         except PyMongoError as e:
@@ -637,6 +841,7 @@ def add_entry():
                     }
                 )
                 recalculate_bank_balances_from_date(entry["bank_id"], today)
+                mark_shop_data_changed()
             except PyMongoError as e:
                 return db_error_redirect("updating entry inline", e)
 
@@ -743,6 +948,8 @@ def add_entry():
                 remaining_balance = opening_balance + credited - debited
 
                 try:
+                    if not widen_shop_entry_bounds(entry_date):
+                        return db_error_redirect("creating entry", "current shop could not be loaded")
                     result = entries_col.insert_one({
                         "date": entry_date,
                         "time": entry_datetime.strftime("%H:%M:%S"),
@@ -759,6 +966,7 @@ def add_entry():
                         flash("Failed to save entry.", "danger")
                         return redirect(url_for("add_entry"))
                     recalculate_bank_balances_from_date(bank_id, entry_date)
+                    mark_shop_data_changed()
                 except PyMongoError as e:
                     return db_error_redirect("creating entry", e)
                 
@@ -873,6 +1081,7 @@ def delete_entry(entry_id):
     try:
         entries_col.delete_one({"_id": entry_oid})
         recalculate_bank_balances_from_date(entry["bank_id"], today)
+        mark_shop_data_changed()
     except PyMongoError as e:
         return db_error_redirect("deleting entry", e)
     flash('Entry deleted successfully!', 'success')
@@ -886,12 +1095,17 @@ register_report_routes(
     app=app,
     entries_col=entries_col,
     current_shop_identifier=current_shop_identifier,
-    shops_col=shops_col,
+    get_current_shop=get_current_shop,
     verify_csrf=verify_csrf,
     check_password_hash_fn=check_password_hash,
     recalculate_bank_balances_from_date=recalculate_bank_balances_from_date,
+    mark_shop_data_changed=mark_shop_data_changed,
+    claim_shop_delete=claim_shop_delete,
+    release_shop_delete=release_shop_delete,
     local_now_fn=local_now,
     local_today_fn=local_today,
+    # zlib page compression trades CPU per PDF for a smaller download.
+    pdf_page_compression=env_bool("PDF_PAGE_COMPRESSION", default=True),
 )
 
 
@@ -1,4 +1,3 @@
-import re
 from flask import current_app, flash, redirect, render_template, request, url_for
 from pymongo import UpdateOne
 from pymongo.errors import PyMongoError
@@ -9,13 +8,19 @@ def register_bank_routes(
     app,
     banks_col,
     entries_col,
-    shops_col,
     parse_non_negative_float,
     check_password_hash_fn,
     to_object_id,
     verify_csrf,
     current_shop_identifier,
+    get_current_shop,
+    mark_shop_data_changed,
 ):
+    # Case-insensitive name match; backed by bank_shop_name_ci_idx (same collation).
+    bank_name_collation = {"locale": "en", "strength": 2}
+    # Only what the balance replay reads; _id is kept for the UpdateOne targets.
+    recalc_projection = {"date": 1, "time": 1, "credited": 1, "debited": 1}
+
     def get_shop_banks():
         try:
             return list(banks_col.find({"shop_identifier": current_shop_identifier()}))
@@ -34,22 +39,6 @@ def register_bank_routes(
             form_values=form_values,
         )
 
-    def get_current_shop():
-        identifier = current_shop_identifier()
-        if not identifier:
-            return None
-        try:
-            return shops_col.find_one({
-                "$or": [
-                    {"identifier": identifier},
-                    {"mobile": identifier},
-                    {"email": identifier},
-                ]
-            })
-        except PyMongoError as e:
-            current_app.logger.error(f"Database error while loading current shop: {e}")
-            return None
-
     def recalculate_bank_balances_from_date(bank_id, start_date):
         try:
             shop_identifier = current_shop_identifier()
@@ -57,7 +46,10 @@ def register_bank_routes(
             if not oid:
                 return
 
-            bank = banks_col.find_one({"_id": oid, "shop_identifier": shop_identifier})
+            bank = banks_col.find_one(
+                {"_id": oid, "shop_identifier": shop_identifier},
+                {"opening_balance": 1},
+            )
             if not bank:
                 return
 
@@ -68,6 +60,7 @@ def register_bank_routes(
                     "shop_identifier": shop_identifier,
                     "date": {"$lt": start_date},
                 },
+                {"_id": 0, "remaining_balance": 1},
                 sort=[("entry_datetime", -1)],
             )
             base_balance = (
@@ -76,11 +69,14 @@ def register_bank_routes(
             )
             base_balance = max(0.0, base_balance)
 
-            raw_entries = list(entries_col.find({
-                "bank_id": str_bank_id,
-                "shop_identifier": shop_identifier,
-                "date": {"$gte": start_date},
-            }))
+            raw_entries = list(entries_col.find(
+                {
+                    "bank_id": str_bank_id,
+                    "shop_identifier": shop_identifier,
+                    "date": {"$gte": start_date},
+                },
+                recalc_projection,
+            ))
             entries = sorted(raw_entries, key=parse_entry_datetime)
 
             balance = base_balance
@@ -115,7 +111,8 @@ def register_bank_routes(
                 bulk_ops.append(UpdateOne({"_id": e["_id"]}, {"$set": updates}))
 
             if bulk_ops:
-                entries_col.bulk_write(bulk_ops)
+                # Each op targets its own _id, so the server may apply them in any order.
+                entries_col.bulk_write(bulk_ops, ordered=False)
         except PyMongoError as e:
             current_app.logger.error(f"Database error while recalculating balances from date: {e}")
 
@@ -166,11 +163,15 @@ def register_bank_routes(
                     )
 
                 try:
-                    existing_bank = banks_col.find_one({
-                        "shop_identifier": shop_identifier,
-                        "name": {"$regex": f"^{re.escape(bank_name)}$", "$options": "i"},
-                        "_id": {"$ne": bank_oid},
-                    })
+                    existing_bank = banks_col.find_one(
+                        {
+                            "shop_identifier": shop_identifier,
+                            "name": bank_name,
+                            "_id": {"$ne": bank_oid},
+                        },
+                        {"_id": 1},
+                        collation=bank_name_collation,
+                    )
                 except PyMongoError as e:
                     current_app.logger.error(f"Database error while checking bank duplicate (inline edit): {e}")
                     flash("Database error occurred. Please try again.", "danger")
@@ -194,16 +195,20 @@ def register_bank_routes(
                     )
 
                 try:
-                    banks_col.update_one(
-                        {"_id": bank_oid},
-                        {"$set": {"name": bank_name, "opening_balance": opening_balance}},
-                    )
-                    earliest_entry = entries_col.find_one(
-                        {"bank_id": str(bank["_id"]), "shop_identifier": shop_identifier},
-                        sort=[("entry_datetime", 1)],
-                    )
-                    if earliest_entry:
-                        recalculate_bank_balances_from_date(edit_bank_id, earliest_entry["date"])
+                    try:
+                        banks_col.update_one(
+                            {"_id": bank_oid},
+                            {"$set": {"name": bank_name, "opening_balance": opening_balance}},
+                        )
+                        earliest_entry = entries_col.find_one(
+                            {"bank_id": str(bank["_id"]), "shop_identifier": shop_identifier},
+                            sort=[("entry_datetime", 1)],
+                        )
+                        if earliest_entry:
+                            recalculate_bank_balances_from_date(edit_bank_id, earliest_entry["date"])
+                    finally:
+                        # The bank update may have applied even if a later step failed.
+                        mark_shop_data_changed()
                 except PyMongoError as e:
                     current_app.logger.error(f"Database error while updating bank (inline edit): {e}")
                     flash("Database error occurred. Please try again.", "danger")
@@ -223,10 +228,11 @@ def register_bank_routes(
                 )
 
             try:
-                existing_bank = banks_col.find_one({
-                    "shop_identifier": shop_identifier,
-                    "name": {"$regex": f"^{re.escape(bank_name)}$", "$options": "i"},
-                })
+                existing_bank = banks_col.find_one(
+                    {"shop_identifier": shop_identifier, "name": bank_name},
+                    {"_id": 1},
+                    collation=bank_name_collation,
+                )
             except PyMongoError as e:
                 current_app.logger.error(f"Database error while checking bank duplicate: {e}")
                 flash("Database error occurred. Please try again.", "danger")
@@ -315,8 +321,12 @@ def register_bank_routes(
         try:
             bank = banks_col.find_one({"_id": bank_oid, "shop_identifier": shop_identifier})
             if bank:
-                entries_col.delete_many({"bank_id": str(bank["_id"]), "shop_identifier": shop_identifier})
-                banks_col.delete_one({"_id": bank_oid})
+                try:
+                    entries_col.delete_many({"bank_id": str(bank["_id"]), "shop_identifier": shop_identifier})
+                    banks_col.delete_one({"_id": bank_oid})
+                finally:
+                    # The entry delete may have applied even if the bank delete failed.
+                    mark_shop_data_changed()
                 bank_name = bank.get("name", "Bank")
                 flash(f"'{bank_name}' bank deleted successfully.", "success")
         except PyMongoError as e:
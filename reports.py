@@ -1,6 +1,11 @@
-import re
+import copy
 import os
+import threading
+import time
+from collections import OrderedDict
 from io import BytesIO
+from itertools import groupby
+from operator import itemgetter
 from datetime import date, datetime, timedelta
 from flask import current_app, flash, redirect, render_template, request, send_file, url_for
 from pymongo.errors import PyMongoError
@@ -16,17 +21,37 @@ try:
 except Exception:
     svg2rlg = None
 
+_BANK_TABLE_HEADER = ("BANK NAME", "TOTAL CREDITS", "TOTAL DEBITS", "CLOSING BALANCE")
+_EMPTY_BANK_ROW = ("-", "0.00", "0.00", "0.00")
+
+# Parsed SVG logo per path, keyed on file mtime so a replaced logo is picked up.
+_LOGO_CACHE = {}
+
+
+def _get_logo_drawing(logo_path):
+    mtime = os.path.getmtime(logo_path)
+    cached = _LOGO_CACHE.get(logo_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    drawing = svg2rlg(logo_path)
+    _LOGO_CACHE[logo_path] = (mtime, drawing)
+    return drawing
+
 
 def register_report_routes(
     app,
     entries_col,
     current_shop_identifier,
-    shops_col,
+    get_current_shop,
     verify_csrf,
     check_password_hash_fn,
     recalculate_bank_balances_from_date,
+    mark_shop_data_changed,
+    claim_shop_delete,
+    release_shop_delete,
     local_now_fn=None,
     local_today_fn=None,
+    pdf_page_compression=True,
 ):
     if local_now_fn is None:
         local_now_fn = datetime.now
@@ -36,6 +61,23 @@ def register_report_routes(
     # Allowed year range for yearly report inputs.
     report_year_min = 2000
     report_year_max = 2100
+    delete_batch_size = 5000
+
+    # Per-process report cache. Keys include the shop's data_version, which every write
+    # bumps, so entries stay valid across workers until they expire.
+    report_cache = {}
+    report_cache_lock = threading.Lock()
+    report_cache_max_entries = 256
+    report_cache_open_ttl = 300
+    report_cache_closed_ttl = 86400
+    # Rendered PDF bytes, LRU-bounded; the TTL caps how old the "Generated On" stamp gets.
+    pdf_cache = OrderedDict()
+    pdf_cache_lock = threading.Lock()
+    pdf_cache_max_entries = 64
+    pdf_cache_ttl = 600
+    # Bank table styles, built once per layout variant.
+    bank_table_style_cache = {}
+
     daily_projection = {
         "_id": 0,
         "date": 1,
@@ -58,6 +100,14 @@ def register_report_routes(
     }
 
     def to_number(value):
+        # Mongo almost always hands back int/float; skip the try/except for those.
+        value_type = type(value)
+        if value_type is float:
+            return value
+        if value_type is int:
+            return float(value)
+        if value is None:
+            return 0.0
         try:
             return float(value)
         except (TypeError, ValueError):
@@ -74,10 +124,15 @@ def register_report_routes(
         return start_obj.isoformat(), end_obj.isoformat()
 
     def get_month_date_range(report_month):
-        if not re.fullmatch(r"\d{4}-\d{2}", report_month or ""):
+        # Shape check for YYYY-MM without a regex; date() validates the month itself.
+        report_month = report_month or ""
+        if len(report_month) != 7 or report_month[4] != "-":
+            return None, None
+        digits = report_month[:4] + report_month[5:]
+        if not (digits.isascii() and digits.isdigit()):
             return None, None
         try:
-            start_obj = date.fromisoformat(f"{report_month}-01")
+            start_obj = date(int(digits[:4]), int(digits[4:]), 1)
         except ValueError:
             return None, None
         next_month = (start_obj.replace(day=28) + timedelta(days=4)).replace(day=1)
@@ -85,17 +140,13 @@ def register_report_routes(
         return start_obj.isoformat(), end_obj.isoformat()
 
     def get_year_date_range(report_year):
-        if not re.fullmatch(r"\d{4}", report_year or ""):
+        report_year = report_year or ""
+        if len(report_year) != 4 or not (report_year.isascii() and report_year.isdigit()):
             return None, None
-        try:
-            year_int = int(report_year)
-            if year_int < report_year_min or year_int > report_year_max:
-                return None, None
-            start_obj = date(year_int, 1, 1)
-            end_obj = date(year_int, 12, 31)
-        except ValueError:
+        year_int = int(report_year)
+        if year_int < report_year_min or year_int > report_year_max:
             return None, None
-        return start_obj.isoformat(), end_obj.isoformat()
+        return f"{report_year}-01-01", f"{report_year}-12-31"
 
     def get_daily_entries_in_range(start_date, end_date):
         try:
@@ -112,21 +163,33 @@ def register_report_routes(
             current_app.logger.error(f"Database error while loading day-wise entries: {e}")
             return []
 
-    def get_day_wise_dates_in_range(start_date, end_date):
-        try:
-            dates = entries_col.distinct(
-                "date",
-                {
+    def get_day_wise_dates_page(start_date, end_date, skip, limit):
+        # One round-trip: the requested page of distinct dates plus the total date count.
+        pipeline = [
+            {
+                "$match": {
                     "date": {"$gte": start_date, "$lte": end_date},
                     "shop_identifier": current_shop_identifier(),
-                },
-            )
-            valid_dates = [d for d in dates if isinstance(d, str)]
-            valid_dates.sort(reverse=True)
-            return valid_dates
+                }
+            },
+            {"$group": {"_id": "$date"}},
+            # Filter before paging so the page and the total count agree.
+            {"$match": {"_id": {"$type": "string"}}},
+            {
+                "$facet": {
+                    "dates": [{"$sort": {"_id": -1}}, {"$skip": skip}, {"$limit": limit}],
+                    "date_count": [{"$count": "n"}],
+                }
+            },
+        ]
+        try:
+            result = next(entries_col.aggregate(pipeline), None) or {}
         except PyMongoError as e:
             current_app.logger.error(f"Database error while loading day-wise dates: {e}")
-            return []
+            return [], 0
+        page_dates = [row["_id"] for row in result.get("dates", [])]
+        date_count = result.get("date_count") or [{}]
+        return page_dates, date_count[0].get("n", 0)
 
     def get_daily_entries_for_dates(selected_dates):
         if not selected_dates:
@@ -145,48 +208,52 @@ def register_report_routes(
             current_app.logger.error(f"Database error while loading paged day-wise entries: {e}")
             return []
 
-    def get_summary_entries_in_range(start_date, end_date):
-        try:
-            return list(
-                entries_col.find(
-                    {
-                        "date": {"$gte": start_date, "$lte": end_date},
-                        "shop_identifier": current_shop_identifier(),
-                    },
-                    summary_projection,
-                )
-            )
-        except PyMongoError as e:
-            current_app.logger.error(f"Database error while loading report summary entries: {e}")
-            return []
+    def get_summary_entries_cursor(start_date, end_date):
+        # Returned unconsumed so build_report can reduce rows as they arrive.
+        return entries_col.find(
+            {
+                "date": {"$gte": start_date, "$lte": end_date},
+                "shop_identifier": current_shop_identifier(),
+            },
+            summary_projection,
+        )
 
     def build_report(entries):
-        total_credit = sum(to_number(e.get("credited", 0)) for e in entries)
-        total_debit = sum(to_number(e.get("debited", 0)) for e in entries)
-
-        summary = {}
+        # Reduce each document to a small tuple as it streams in (parsing missing datetimes
+        # once), then one stable sort by bank and datetime; each bank's closing balance is
+        # simply its last row.
+        decorated = []
         for e in entries:
             bank_name = e.get("bank_name") or "Unknown"
-            credited = to_number(e.get("credited", 0))
-            debited = to_number(e.get("debited", 0))
-            remaining_balance = to_number(e.get("remaining_balance", 0))
             e_dt = e.get("entry_datetime") or parse_entry_datetime(e)
-            summary.setdefault(bank_name, {"credit": 0.0, "debit": 0.0, "close": remaining_balance, "dt": e_dt})
-            summary[bank_name]["credit"] += credited
-            summary[bank_name]["debit"] += debited
-            if e_dt >= summary[bank_name]["dt"]:
-                summary[bank_name]["close"] = remaining_balance
-                summary[bank_name]["dt"] = e_dt
-
+            sort_key = bank_name.lower() if isinstance(bank_name, str) else ""
+            decorated.append((
+                sort_key,
+                bank_name,
+                e_dt,
+                to_number(e.get("credited", 0)),
+                to_number(e.get("debited", 0)),
+                to_number(e.get("remaining_balance", 0)),
+            ))
+        decorated.sort(key=itemgetter(0, 1, 2))
+
+        total_credit = 0.0
+        total_debit = 0.0
         bank_wise = []
-        for bank_name, values in summary.items():
+        for (_, bank_name), rows in groupby(decorated, key=itemgetter(0, 1)):
+            bank_credit = 0.0
+            bank_debit = 0.0
+            for _, _, _, credited, debited, remaining_balance in rows:
+                bank_credit += credited
+                bank_debit += debited
+            total_credit += bank_credit
+            total_debit += bank_debit
             bank_wise.append({
                 "bank": bank_name,
-                "total_credit": values["credit"],
-                "total_debit": values["debit"],
-                "closing_balance": values["close"],
+                "total_credit": bank_credit,
+                "total_debit": bank_debit,
+                "closing_balance": remaining_balance,
             })
-        bank_wise.sort(key=lambda x: x["bank"].lower() if isinstance(x["bank"], str) else "")
 
         most_used = (
             max(bank_wise, key=lambda x: x["total_credit"] + x["total_debit"])["bank"]
@@ -217,6 +284,8 @@ def register_report_routes(
                     "closing_balance": {"$last": {"$ifNull": ["$remaining_balance", 0]}},
                 }
             },
+            {"$addFields": {"sort_key": {"$toLower": "$_id"}}},
+            {"$sort": {"sort_key": 1}},
             {
                 "$project": {
                     "_id": 0,
@@ -224,44 +293,163 @@ def register_report_routes(
                     "total_credit": 1,
                     "total_debit": 1,
                     "closing_balance": 1,
+                    "activity": {"$add": ["$total_credit", "$total_debit"]},
+                }
+            },
+            {
+                # Roll the sorted bank rows into one document with the overall totals.
+                "$group": {
+                    "_id": None,
+                    "rows": {"$push": "$$ROOT"},
+                    "total_credit": {"$sum": "$total_credit"},
+                    "total_debit": {"$sum": "$total_debit"},
+                    "closing_balance": {"$sum": "$closing_balance"},
+                }
+            },
+            {
+                # First bank (in name order) with the highest activity, matching max() semantics.
+                "$addFields": {
+                    "most_used_bank": {
+                        "$reduce": {
+                            "input": "$rows",
+                            "initialValue": {"bank": "N/A", "activity": None},
+                            "in": {
+                                "$cond": [
+                                    {"$gt": ["$$this.activity", "$$value.activity"]},
+                                    {"bank": "$$this.bank", "activity": "$$this.activity"},
+                                    "$$value",
+                                ]
+                            },
+                        }
+                    }
                 }
             },
         ]
 
-        bank_wise = list(entries_col.aggregate(pipeline, allowDiskUse=True))
-        for row in bank_wise:
-            row["bank"] = row.get("bank") or "Unknown"
-            row["total_credit"] = to_number(row.get("total_credit"))
-            row["total_debit"] = to_number(row.get("total_debit"))
-            row["closing_balance"] = to_number(row.get("closing_balance"))
-
-        bank_wise.sort(key=lambda x: x["bank"].lower() if isinstance(x["bank"], str) else "")
-        if not bank_wise:
+        result = next(entries_col.aggregate(pipeline, allowDiskUse=True), None)
+        if not result or not result.get("rows"):
             return None, []
 
-        total_credit = sum(b["total_credit"] for b in bank_wise)
-        total_debit = sum(b["total_debit"] for b in bank_wise)
-        most_used = max(bank_wise, key=lambda x: x["total_credit"] + x["total_debit"])["bank"]
+        bank_wise = []
+        for row in result["rows"]:
+            bank_wise.append({
+                "bank": row.get("bank") or "Unknown",
+                "total_credit": to_number(row.get("total_credit")),
+                "total_debit": to_number(row.get("total_debit")),
+                "closing_balance": to_number(row.get("closing_balance")),
+            })
+
         report = {
-            "total_credit": total_credit,
-            "total_debit": total_debit,
-            "most_used_bank": most_used,
-            "closing_balance": sum(b["closing_balance"] for b in bank_wise),
+            "total_credit": to_number(result.get("total_credit")),
+            "total_debit": to_number(result.get("total_debit")),
+            "most_used_bank": (result.get("most_used_bank") or {}).get("bank") or "Unknown",
+            "closing_balance": to_number(result.get("closing_balance")),
         }
         return report, bank_wise
 
-    def build_report_for_range(start_date, end_date, closing_key="closing_balance"):
+    def range_has_no_entries(start_date, end_date):
+        # Uses the shop's tracked entry date span (request-cached) to skip Mongo for empty ranges.
+        shop = get_current_shop()
+        if not shop or not shop.get("entry_bounds_tracked"):
+            return False
+        min_entry_date = shop.get("min_entry_date")
+        max_entry_date = shop.get("max_entry_date")
+        if not min_entry_date or not max_entry_date:
+            return True
+        return end_date < min_entry_date or start_date > max_entry_date
+
+    def fetch_report_for_range(start_date, end_date):
+        # Raises PyMongoError when neither the aggregate nor the fallback could read Mongo,
+        # so callers can tell a failed read apart from a genuinely empty range.
+        if range_has_no_entries(start_date, end_date):
+            return None, []
         try:
-            report, bank_wise = build_report_aggregate(start_date, end_date)
+            return build_report_aggregate(start_date, end_date)
         except PyMongoError as e:
             # Fallback to in-memory summary if aggregation fails.
             current_app.logger.error(f"Database error while aggregating report range: {e}")
-            entries = get_summary_entries_in_range(start_date, end_date)
-            if not entries:
+            report, bank_wise = build_report(get_summary_entries_cursor(start_date, end_date))
+            if not bank_wise:
                 return None, []
-            report, bank_wise = build_report(entries)
+            return report, bank_wise
+
+    def compute_report_for_range(start_date, end_date):
+        try:
+            return fetch_report_for_range(start_date, end_date)
+        except PyMongoError as e:
+            current_app.logger.error(f"Database error while loading report summary entries: {e}")
+            return None, []
+
+    def get_cached_report_for_range(start_date, end_date):
+        shop = get_current_shop()
+        if not shop:
+            return compute_report_for_range(start_date, end_date)
+
+        cache_key = (current_shop_identifier(), shop.get("data_version", 0), start_date, end_date)
+        now = time.monotonic()
+        cached = report_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+
+        try:
+            report, bank_wise = fetch_report_for_range(start_date, end_date)
+        except PyMongoError as e:
+            # Not cached: a failed read must not pin an empty report until the TTL expires.
+            current_app.logger.error(f"Database error while loading report summary entries: {e}")
+            return None, []
+
+        # Ranges reaching today can still gain entries; fully past ranges only change on writes.
+        ttl = report_cache_open_ttl if end_date >= local_today_fn().isoformat() else report_cache_closed_ttl
+        with report_cache_lock:
+            if len(report_cache) >= report_cache_max_entries:
+                for key in [k for k, v in report_cache.items() if v[0] <= now]:
+                    del report_cache[key]
+                if len(report_cache) >= report_cache_max_entries:
+                    del report_cache[next(iter(report_cache))]
+            report_cache[cache_key] = (now + ttl, report, bank_wise)
+        return report, bank_wise
+
+    def get_pdf_cache_key(period_kind, period_value):
+        shop = get_current_shop()
+        if not shop:
+            return None
+        # data_version covers entry/bank writes; the name is printed in the header.
+        return (
+            current_shop_identifier(),
+            shop.get("data_version", 0),
+            shop.get("name"),
+            period_kind,
+            period_value,
+        )
+
+    def get_cached_pdf(cache_key):
+        if cache_key is None:
+            return None
+        with pdf_cache_lock:
+            cached = pdf_cache.get(cache_key)
+            if not cached:
+                return None
+            if cached[0] <= time.monotonic():
+                del pdf_cache[cache_key]
+                return None
+            pdf_cache.move_to_end(cache_key)
+            return cached[1]
+
+    def store_cached_pdf(cache_key, pdf_bytes):
+        if cache_key is None:
+            return
+        with pdf_cache_lock:
+            pdf_cache[cache_key] = (time.monotonic() + pdf_cache_ttl, pdf_bytes)
+            pdf_cache.move_to_end(cache_key)
+            while len(pdf_cache) > pdf_cache_max_entries:
+                pdf_cache.popitem(last=False)
+
+    def build_report_for_range(start_date, end_date, closing_key="closing_balance"):
+        report, bank_wise = get_cached_report_for_range(start_date, end_date)
 
         if report and closing_key != "closing_balance" and "closing_balance" in report:
+            # Copy so a cached report keeps its original key.
+            report = dict(report)
             report[closing_key] = report.pop("closing_balance")
         return report, bank_wise
 
@@ -274,46 +462,70 @@ def register_report_routes(
         return start_date, end_date
 
     def delete_entries_preserve_balances(range_start, range_end):
+        if range_has_no_entries(range_start, range_end):
+            return 0
         query = {
             "date": {"$gte": range_start, "$lte": range_end},
             "shop_identifier": current_shop_identifier(),
         }
-        delete_result = entries_col.delete_many(query)
-        return delete_result.deleted_count
-
-    def format_amount_for_pdf(value):   
-        try:
-            amount = float(value)
-        except (TypeError, ValueError):
-            return "0.00"
-
-        is_negative = amount < 0
-        amount = abs(amount)
-        rounded_amount = round(amount + 1e-9, 2)
-
-        whole_part = int(rounded_amount)
-        decimal_part = int(round((rounded_amount - whole_part) * 100))
-        if decimal_part == 100:
-            whole_part += 1
+        # Delete in bounded _id batches so large month/year purges never run as one
+        # long unbounded delete_many.
+        deleted_count = 0
+        batch = []
+        cursor = entries_col.find(query, {"_id": 1}).sort("date", 1).batch_size(delete_batch_size)
+        for doc in cursor:
+            batch.append(doc["_id"])
+            if len(batch) >= delete_batch_size:
+                deleted_count += entries_col.delete_many({"_id": {"$in": batch}}).deleted_count
+                batch = []
+        if batch:
+            deleted_count += entries_col.delete_many({"_id": {"$in": batch}}).deleted_count
+        return deleted_count
+
+    def format_amount_for_pdf(value):
+        value_type = type(value)
+        if value_type is int:
+            # Whole rupees: no float round-trip needed.
+            is_negative = value < 0
+            whole_part = -value if is_negative else value
             decimal_part = 0
+        else:
+            if value_type is float:
+                amount = value
+            else:
+                try:
+                    amount = float(value)
+                except (TypeError, ValueError):
+                    return "0.00"
+
+            is_negative = amount < 0
+            amount = abs(amount)
+            if amount.is_integer():
+                whole_part = int(amount)
+                decimal_part = 0
+            else:
+                rounded_amount = round(amount + 1e-9, 2)
+                whole_part = int(rounded_amount)
+                decimal_part = int(round((rounded_amount - whole_part) * 100))
+                if decimal_part == 100:
+                    whole_part += 1
+                    decimal_part = 0
 
         whole_text = str(whole_part)
         if len(whole_text) > 3:
-            last_three = whole_text[-3:]
+            # Indian grouping: last three digits, then pairs.
             rest = whole_text[:-3]
-            parts = []
-            while len(rest) > 2:
-                parts.insert(0, rest[-2:])
-                rest = rest[:-2]
-            if rest:
-                parts.insert(0, rest)
-            whole_text = ",".join(parts + [last_three])
+            lead = len(rest) % 2
+            parts = [rest[:lead]] if lead else []
+            parts.extend(rest[i:i + 2] for i in range(lead, len(rest), 2))
+            parts.append(whole_text[-3:])
+            whole_text = ",".join(parts)
 
         formatted = f"{whole_text}.{decimal_part:02d}"
-        return f"-{formatted}" if is_negative else formatted
+        return "-" + formatted if is_negative else formatted
 
     def format_rupee_for_pdf(value):
-        return f"Rs. {format_amount_for_pdf(value)}"
+        return "Rs. " + format_amount_for_pdf(value)
 
     def build_summary_pdf(period_value, report, bank_wise, report_title, period_label, closing_balance_key, period_kind):
         # Shared PDF renderer used by both monthly and yearly exports.
@@ -341,7 +553,7 @@ def register_report_routes(
         generated_on = local_now_fn().strftime("%d/%m/%Y %H:%M")
 
         buffer = BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+        pdf = canvas.Canvas(buffer, pagesize=A4, pageCompression=1 if pdf_page_compression else 0)
         page_width, page_height = A4
 
         page_bg_color = colors.white
@@ -378,6 +590,8 @@ def register_report_routes(
         compact_header_font = max(7.2, scaled(7.6))
         compact_body_font = max(8.2, scaled(9))
         compact_vertical_padding = max(5.5, scaled(7))
+        # Table cells keep ReportLab's default 12pt leading (FONTSIZE does not change it).
+        table_cell_leading = 12
 
         def from_content_top(top_value):
             return top_value + top_offset
@@ -391,7 +605,10 @@ def register_report_routes(
 
         if svg2rlg and os.path.exists(logo_path):
             try:
-                logo_drawing = svg2rlg(logo_path)
+                cached_logo = _get_logo_drawing(logo_path)
+                # Renderers set/delete _parent/_canvas on every node while drawing, so each
+                # render gets its own copy; sharing one Drawing races across threads.
+                logo_drawing = copy.deepcopy(cached_logo) if cached_logo else None
                 if logo_drawing and logo_drawing.width and logo_drawing.height:
                     original_width = float(logo_drawing.width)
                     original_height = float(logo_drawing.height)
@@ -400,9 +617,15 @@ def register_report_routes(
                         logo_target_height / original_height,
                     )
                     logo_draw_height = original_height * logo_scale
-                    logo_drawing.scale(logo_scale, logo_scale)
                     logo_y = y_from_top(logo_top + logo_draw_height)
-                    renderPDF.draw(logo_drawing, pdf, logo_x, logo_y)
+                    pdf.saveState()
+                    try:
+                        pdf.translate(logo_x, logo_y)
+                        pdf.scale(logo_scale, logo_scale)
+                        renderPDF.draw(logo_drawing, pdf, 0, 0)
+                    finally:
+                        # Never leave the logo transform applied to the rest of the page.
+                        pdf.restoreState()
                     logo_drawn = True
             except Exception as logo_error:
                 current_app.logger.warning(f"Failed to render SVG logo in {period_kind} PDF: {logo_error}")
@@ -474,76 +697,91 @@ def register_report_routes(
         pdf.setFont("Helvetica-Bold", section_heading_font)
         pdf.drawString(left_margin + 16, y_from_top(bank_heading_top + 10), "Bank-Wise Summary")
 
-        table_data = [["BANK NAME", "TOTAL CREDITS", "TOTAL DEBITS", "CLOSING BALANCE"]]
+        # Table accepts any sequence of sequences, so the shared header/empty rows are
+        # used as-is and bank rows are built in one comprehension.
+        table_data = [_BANK_TABLE_HEADER]
         if bank_wise:
-            for bank in bank_wise:
-                table_data.append([
+            table_data += [
+                (
                     str(bank.get("bank", "-")),
                     format_amount_for_pdf(bank.get("total_credit", 0)),
                     format_amount_for_pdf(bank.get("total_debit", 0)),
                     format_amount_for_pdf(bank.get("closing_balance", 0)),
-                ])
+                )
+                for bank in bank_wise
+            ]
         else:
-            table_data.append(["-", "0.00", "0.00", "0.00"])
+            table_data.append(_EMPTY_BANK_ROW)
 
-        table_data.append([
+        table_data.append((
             "Grand Total",
             format_rupee_for_pdf(report.get("total_credit", 0)),
             format_rupee_for_pdf(report.get("total_debit", 0)),
             format_rupee_for_pdf(report.get(closing_balance_key, 0)),
-        ])
+        ))
 
         table_width = content_width
-        bank_table = Table(
-            table_data,
-            colWidths=[table_width * 0.34, table_width * 0.22, table_width * 0.22, table_width * 0.22],
-            repeatRows=1,
-        )
-
-        grand_row_index = len(table_data) - 1
-        bank_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f1f5f9")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), label_color),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, 0), table_header_font),
-            ("FONTNAME", (0, 1), (-1, -1), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 1), (-1, -1), table_body_font),
-            ("TEXTCOLOR", (0, 1), (-1, -1), text_dark),
-            ("ALIGN", (0, 0), (0, -1), "LEFT"),
-            ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("LINEABOVE", (0, 0), (-1, 0), 1, border_color),
-            ("LINEBELOW", (0, 0), (-1, 0), 1, border_color),
-            ("LINEBELOW", (0, 1), (-1, -1), 0.7, border_color),
-            ("LEFTPADDING", (0, 0), (-1, -1), table_side_padding),
-            ("RIGHTPADDING", (0, 0), (-1, -1), table_side_padding),
-            ("TOPPADDING", (0, 0), (-1, -1), table_vertical_padding),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), table_vertical_padding),
-            ("BACKGROUND", (0, grand_row_index), (-1, grand_row_index), colors.HexColor("#f8fafc")),
-            ("FONTNAME", (0, grand_row_index), (-1, grand_row_index), "Helvetica-Bold"),
-            ("TEXTCOLOR", (0, grand_row_index), (-1, grand_row_index), text_dark),
-            ("LINEABOVE", (0, grand_row_index), (-1, grand_row_index), 1, border_color),
-            ("LINEBELOW", (0, grand_row_index), (-1, grand_row_index), 1, border_color),
-            ("BOX", (0, 0), (-1, -1), 1, border_color),
-        ]))
-
         table_top = bank_heading_top + max(24, scaled(28))
-        _, table_height = bank_table.wrap(table_width, page_height)
+        header_font = table_header_font
+        body_font = table_body_font
+        vertical_padding = table_vertical_padding
+
+        # Fixed row heights let us place the table analytically; Table.wrap then
+        # only lays out positions instead of measuring every cell's text.
+        row_height = table_cell_leading + (2 * vertical_padding)
+        table_height = row_height * len(table_data)
         table_y = y_from_top(table_top + table_height)
 
         if table_y < bottom_margin:
             # Compact table fonts/padding if content is close to bottom margin.
-            bank_table.setStyle(TableStyle([
-                ("FONTSIZE", (0, 0), (-1, 0), compact_header_font),
-                ("FONTSIZE", (0, 1), (-1, -1), compact_body_font),
-                ("TOPPADDING", (0, 0), (-1, -1), compact_vertical_padding),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), compact_vertical_padding),
-            ]))
-            _, table_height = bank_table.wrap(table_width, page_height)
+            header_font = compact_header_font
+            body_font = compact_body_font
+            vertical_padding = compact_vertical_padding
+            row_height = table_cell_leading + (2 * vertical_padding)
+            table_height = row_height * len(table_data)
             table_y = y_from_top(table_top + table_height)
             if table_y < bottom_margin:
                 table_y = bottom_margin
 
+        bank_table = Table(
+            table_data,
+            colWidths=[table_width * 0.34, table_width * 0.22, table_width * 0.22, table_width * 0.22],
+            rowHeights=[row_height] * len(table_data),
+            repeatRows=1,
+        )
+
+        # Styles only vary by the normal/compact layout, so build each one once per process.
+        # The grand total is always the last row, addressed as -1.
+        style_key = (header_font, body_font, vertical_padding)
+        bank_table_style = bank_table_style_cache.get(style_key)
+        if bank_table_style is None:
+            bank_table_style = TableStyle([
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f1f5f9")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), label_color),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), header_font),
+                ("FONTNAME", (0, 1), (-1, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 1), (-1, -1), body_font),
+                ("TEXTCOLOR", (0, 1), (-1, -1), text_dark),
+                ("ALIGN", (0, 0), (0, -1), "LEFT"),
+                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LINEABOVE", (0, 0), (-1, 0), 1, border_color),
+                ("LINEBELOW", (0, 0), (-1, 0), 1, border_color),
+                ("LINEBELOW", (0, 1), (-1, -1), 0.7, border_color),
+                ("LEFTPADDING", (0, 0), (-1, -1), table_side_padding),
+                ("RIGHTPADDING", (0, 0), (-1, -1), table_side_padding),
+                ("TOPPADDING", (0, 0), (-1, -1), vertical_padding),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), vertical_padding),
+                ("BACKGROUND", (0, -1), (-1, -1), colors.HexColor("#f8fafc")),
+                ("LINEABOVE", (0, -1), (-1, -1), 1, border_color),
+                ("LINEBELOW", (0, -1), (-1, -1), 1, border_color),
+                ("BOX", (0, 0), (-1, -1), 1, border_color),
+            ])
+            bank_table_style_cache[style_key] = bank_table_style
+        bank_table.setStyle(bank_table_style)
+        bank_table.wrap(table_width, page_height)
+
         bank_table.drawOn(pdf, left_margin, table_y)
 
         pdf.showPage()
@@ -567,22 +805,6 @@ def register_report_routes(
             period_kind="monthly",
         )
 
-    def get_current_shop():
-        identifier = current_shop_identifier()
-        if not identifier:
-            return None
-        try:
-            return shops_col.find_one({
-                "$or": [
-                    {"identifier": identifier},
-                    {"mobile": identifier},
-                    {"email": identifier},
-                ]
-            })
-        except PyMongoError as e:
-            current_app.logger.error(f"Database error while loading current shop: {e}")
-            return None
-
     @app.route("/daily-report")
     def daily_report():
         start_date = (request.args.get("start_date") or "").strip()
@@ -599,16 +821,24 @@ def register_report_routes(
             valid_start, valid_end = normalize_date_range(start_date, end_date)
             if not valid_start:
                 flash("Please select a valid date range.", "danger")
-            else:
-                all_dates = get_day_wise_dates_in_range(valid_start, valid_end)
-                total_days = len(all_dates)
+            elif not range_has_no_entries(valid_start, valid_end):
+                page_dates, total_days = get_day_wise_dates_page(
+                    valid_start,
+                    valid_end,
+                    skip=(page - 1) * days_per_page,
+                    limit=days_per_page,
+                )
                 if total_days > 0:
                     total_pages = (total_days + days_per_page - 1) // days_per_page
                     if page > total_pages:
+                        # Requested page is past the end; reload the last page.
                         page = total_pages
-                    start_idx = (page - 1) * days_per_page
-                    end_idx = start_idx + days_per_page
-                    page_dates = all_dates[start_idx:end_idx]
+                        page_dates, total_days = get_day_wise_dates_page(
+                            valid_start,
+                            valid_end,
+                            skip=(page - 1) * days_per_page,
+                            limit=days_per_page,
+                        )
                     entries = get_daily_entries_for_dates(page_dates)
                     grouped_entries = group_entries_by_date(entries)
 
@@ -663,15 +893,22 @@ def register_report_routes(
         if not month_start:
             return redirect(url_for("monthly_report"))
 
-        report, bank_wise = build_report_for_range(
-            month_start,
-            month_end,
-            closing_key="month_closing_balance",
-        )
+        # Unchanged ledger data re-downloads the same bytes without touching Mongo or ReportLab.
+        cache_key = get_pdf_cache_key("monthly", report_month)
+        pdf_bytes = get_cached_pdf(cache_key)
+        if pdf_bytes is None:
+            report, bank_wise = build_report_for_range(
+                month_start,
+                month_end,
+                closing_key="month_closing_balance",
+            )
 
-        if not report:
-            flash("No data found for the selected month.", "danger")
-            return redirect(url_for("monthly_report", report_month=report_month))
+            if not report:
+                flash("No data found for the selected month.", "danger")
+                return redirect(url_for("monthly_report", report_month=report_month))
+
+            pdf_bytes = build_monthly_pdf(report_month, report, bank_wise).getvalue()
+            store_cached_pdf(cache_key, pdf_bytes)
 
         try:
             date_obj = date.fromisoformat(f"{report_month}-01")
@@ -679,9 +916,8 @@ def register_report_routes(
         except ValueError:
             formatted_name = f"monthly_summary_report_{report_month}.pdf"
 
-        pdf_file = build_monthly_pdf(report_month, report, bank_wise)
         return send_file(
-            pdf_file,
+            BytesIO(pdf_bytes),
             as_attachment=True,
             download_name=formatted_name,
             mimetype="application/pdf",
@@ -710,20 +946,25 @@ def register_report_routes(
         if not year_start:
             return redirect(url_for("yearly_report"))
 
-        report, bank_wise = build_report_for_range(
-            year_start,
-            year_end,
-            closing_key="year_closing_balance",
-        )
-        if not report:
-            flash("No data found for the selected year.", "danger")
-            return redirect(url_for("yearly_report", report_year=report_year))
+        cache_key = get_pdf_cache_key("yearly", report_year)
+        pdf_bytes = get_cached_pdf(cache_key)
+        if pdf_bytes is None:
+            report, bank_wise = build_report_for_range(
+                year_start,
+                year_end,
+                closing_key="year_closing_balance",
+            )
+            if not report:
+                flash("No data found for the selected year.", "danger")
+                return redirect(url_for("yearly_report", report_year=report_year))
+
+            pdf_bytes = build_yearly_pdf(report_year, report, bank_wise).getvalue()
+            store_cached_pdf(cache_key, pdf_bytes)
 
         formatted_name = f"{report_year} Yearly Summary Report.pdf"
-        pdf_file = build_yearly_pdf(report_year, report, bank_wise)
         
         return send_file(
-            pdf_file,
+            BytesIO(pdf_bytes),
             as_attachment=True,
             download_name=formatted_name,
             mimetype="application/pdf",
@@ -802,19 +1043,30 @@ def register_report_routes(
             flash("Incorrect password. Data was not deleted.", "danger")
             return redirect(url_for("reports"))
 
+        # Guard against double submits/retries re-running the same bulk delete.
+        delete_key = f"{delete_type}:{period_value}"
+        if not claim_shop_delete(delete_key):
+            flash(f"{period_label} delete is already in progress or just completed.", "info")
+            return redirect(url_for("reports"))
+
         try:
             deleted_count = delete_entries_preserve_balances(
                 range_start=range_start,
                 range_end=range_end,
             )
-
             flash(
                 f"{period_label} data deleted successfully. {deleted_count} entries removed.",
                 "success",
             )
         except PyMongoError as e:
             current_app.logger.error(f"Database error while deleting report data: {e}")
+            # Let the user retry straight away after a failed delete.
+            release_shop_delete(delete_key)
             flash("Database error occurred. Please try again.", "danger")
+        finally:
+            # Earlier batches may have been deleted even when a later one failed, so
+            # invalidate cached reports/PDFs on every path.
+            mark_shop_data_changed()
 
         return redirect(url_for("reports"))
 
@@ -1,22 +1,53 @@
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import methodcaller
+
+
+_entry_date_key = methodcaller("get", "date")
 
 
 def group_entries_by_date(entries):
-    grouped_entries = []
-    current_date = None
-    for entry in entries:
-        entry_date = entry.get("date")
-        if entry_date != current_date:
-            grouped_entries.append({"date": entry_date, "rows": [entry]})
-            current_date = entry_date
-        else:
-            grouped_entries[-1]["rows"].append(entry)
-    return grouped_entries
+    # Entries arrive sorted by date, so same-date rows are contiguous. methodcaller keeps
+    # the old .get("date") tolerance for rows without a date, unlike itemgetter.
+    return [
+        {"date": entry_date, "rows": list(rows)}
+        for entry_date, rows in groupby(entries, key=_entry_date_key)
+    ]
 
 
 def parse_entry_datetime(entry):
     d_str = entry.get("date", "1970-01-01")
     t_str = entry.get("time", "00:00:00")
+    if isinstance(d_str, str) and isinstance(t_str, str):
+        return _parse_date_time(d_str, t_str)
+    return _parse_date_time_slow(d_str, t_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_time(d_str, t_str):
+    # Fast path for the canonical "YYYY-MM-DD" + "HH:MM[:SS]" strings the app writes.
+    if (
+        len(d_str) == 10 and d_str[4] == "-" and d_str[7] == "-"
+        and len(t_str) in (5, 8) and t_str[2] == ":" and (len(t_str) == 5 or t_str[5] == ":")
+    ):
+        digits = d_str[0:4] + d_str[5:7] + d_str[8:10] + t_str[0:2] + t_str[3:5] + t_str[6:8]
+        if digits.isascii() and digits.isdigit():
+            try:
+                return datetime(
+                    int(digits[0:4]),
+                    int(digits[4:6]),
+                    int(digits[6:8]),
+                    int(digits[8:10]),
+                    int(digits[10:12]),
+                    int(digits[12:14] or 0),
+                )
+            except ValueError:
+                pass
+    return _parse_date_time_slow(d_str, t_str)
+
+
+def _parse_date_time_slow(d_str, t_str):
     try:
         return datetime.strptime(f"{d_str} {t_str}", "%Y-%m-%d %H:%M:%S")
     except ValueError: